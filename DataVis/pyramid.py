@@ -0,0 +1,234 @@
+import pandas as pd
+
+# Explanation of the functions
+# build_pyramid: Precompute OHLCV aggregates at several resolutions (1min -> 5min -> 1h -> 1D)
+# query_pyramid: Return the level that best fits a time range and a pixel budget
+# update_pyramid: Append new base bars and refresh only the affected trailing buckets
+# save_pyramid / load_pyramid: Store all levels together in a single file
+# This file lets the DataVis notebooks chart years of minute data without plotting millions of points
+
+
+DEFAULT_LEVELS = ['1min', '5min', '1h', '1D']
+
+# How each column is combined when bars are merged into a coarser bucket
+OHLCV_AGG = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'QuoteAssetVolume': 'sum',
+    'NumberOfTrades': 'sum',
+    'TakerBuyBaseVolume': 'sum',
+    'TakerBuyQuoteVolume': 'sum',
+}
+
+
+def _to_time_index(df, time_col='OpenTime'):
+    """
+    Return a copy of df indexed and sorted by bar open time.
+    OpenTime may be Unix milliseconds (raw Binance data) or datetime strings (sample csv).
+    """
+    df = df.copy()
+    if time_col in df.columns:
+        times = df[time_col]
+        if pd.api.types.is_numeric_dtype(times):
+            times = pd.to_datetime(times, unit='ms')
+        else:
+            times = pd.to_datetime(times)
+        df = df.drop(columns=[time_col])
+        df.index = pd.DatetimeIndex(times, name=time_col)
+    elif not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError(f"DataFrame needs a '{time_col}' column or a DatetimeIndex")
+
+    df = df[[col for col in OHLCV_AGG if col in df.columns]].astype(float)
+    return df.sort_index()
+
+
+def _aggregate(df, freq):
+    """
+    Aggregate OHLCV bars into buckets of size freq, dropping buckets with no bars (data gaps).
+    """
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in df.columns}
+    out = df.resample(freq, label='left', closed='left').agg(agg)
+    return out.dropna(subset=['Open'])
+
+
+def _check_levels(levels):
+    """
+    Make sure every level is a fixed width that divides a day evenly, and an exact multiple
+    of the one below it, so aggregating level by level gives the same bars as aggregating
+    the base series. Dividing a day keeps resample (anchored at midnight of the first day)
+    and Timestamp.floor (anchored at the Unix epoch) on the same bucket boundaries.
+    """
+    for level in levels:
+        offset = pd.tseries.frequencies.to_offset(level)
+        if not isinstance(offset, (pd.offsets.Tick, pd.offsets.Day)):
+            raise ValueError(f"Level '{level}' is not a fixed-width frequency")
+        if pd.Timedelta('1D') % pd.Timedelta(level) != pd.Timedelta(0):
+            raise ValueError(f"Level '{level}' does not divide a day evenly")
+
+    deltas = [pd.Timedelta(level) for level in levels]
+    for finer, coarser, level in zip(deltas, deltas[1:], levels[1:]):
+        if coarser <= finer or coarser % finer != pd.Timedelta(0):
+            raise ValueError(f"Level '{level}' is not a multiple of the level below it")
+
+
+def build_pyramid(df, levels=DEFAULT_LEVELS, time_col='OpenTime'):
+    """
+    Precompute OHLCV aggregates at several resolutions from the base series.
+    Each level is built from the previous one, which is exact for first/max/min/last/sum.
+
+    Parameters:
+    df: DataFrame with OHLCV data at the resolution of levels[0]
+    levels: Increasing pandas frequency strings, finest first (default 1min, 5min, 1h, 1D)
+    time_col: Column holding the bar open time
+
+    Returns:
+    Dict mapping each level to a DataFrame indexed by bar open time.
+    """
+    levels = list(levels)
+    _check_levels(levels)
+
+    pyramid = {levels[0]: _to_time_index(df, time_col)}
+    for finer, coarser in zip(levels, levels[1:]):
+        pyramid[coarser] = _aggregate(pyramid[finer], coarser)
+
+    return pyramid
+
+
+def query_pyramid(pyramid, start=None, end=None, max_points=2000):
+    """
+    Return the bars to plot for a time range, picking the coarsest level needed to stay
+    within max_points. This is the finest level whose bar count in the range fits the budget;
+    if no level fits, the coarsest level is used.
+
+    Parameters:
+    pyramid: Dict returned by build_pyramid
+    start, end: Range to plot (anything pd.Timestamp accepts, None for open ended)
+    max_points: Pixel budget, i.e. the most bars worth drawing (roughly the plot width in pixels)
+
+    Returns:
+    (level, DataFrame) for the chosen level, sliced to [start, end].
+    """
+    if not pyramid:
+        raise ValueError("Pyramid has no levels")
+
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    def window(level):
+        # Align start to the bucket containing it so the first coarse bar is not dropped
+        level_start = start.floor(level) if start is not None else None
+        return pyramid[level].loc[level_start:end]
+
+    levels = list(pyramid)
+    for level in levels:
+        bars = window(level)
+        if len(bars) <= max_points:
+            return level, bars
+
+    return levels[-1], window(levels[-1])
+
+
+def update_pyramid(pyramid, new_bars, time_col='OpenTime'):
+    """
+    Append new base bars and recompute only the trailing buckets they touch at each level.
+    Bars with an open time already in the base level replace the old ones (e.g. a still-open candle).
+
+    Parameters:
+    pyramid: Dict returned by build_pyramid (updated in place)
+    new_bars: DataFrame with OHLCV data at the base resolution
+
+    Returns:
+    The updated pyramid.
+    """
+    levels = list(pyramid)
+    new_bars = _to_time_index(new_bars, time_col)
+    if new_bars.empty:
+        return pyramid
+
+    # Base rows before the first new bar are untouched; only the tail is merged and sorted
+    first_changed = new_bars.index[0]
+    base = pyramid[levels[0]]
+    kept = base.loc[:first_changed - pd.Timedelta(1)]
+    tail = pd.concat([base.loc[first_changed:], new_bars])
+    tail = tail[~tail.index.duplicated(keep='last')].sort_index()
+    pyramid[levels[0]] = pd.concat([kept, tail])
+
+    for finer, coarser in zip(levels, levels[1:]):
+        # Everything from the bucket holding the first new bar onwards has to be rebuilt
+        bucket_start = first_changed.floor(coarser)
+        kept = pyramid[coarser].loc[:bucket_start - pd.Timedelta(1)]
+        fresh = _aggregate(pyramid[finer].loc[bucket_start:], coarser)
+        pyramid[coarser] = pd.concat([kept, fresh])
+        first_changed = bucket_start
+
+    return pyramid
+
+
+def save_pyramid(pyramid, path):
+    """
+    Store all levels of the pyramid together in a single pickle file.
+    """
+    pd.to_pickle(pyramid, path)
+
+
+def load_pyramid(path):
+    """
+    Load a pyramid written by save_pyramid.
+    """
+    return pd.read_pickle(path)
+
+
+if __name__ == '__main__':
+    # Self-check against the sample data: python pyramid.py
+    import os
+    import tempfile
+
+    sample = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      'solana_price_usd_sample.csv'))
+
+    def assert_same(left, right):
+        assert list(left) == list(right)
+        for level in left:
+            pd.testing.assert_frame_equal(left[level], right[level], check_freq=False)
+
+    for levels in (DEFAULT_LEVELS, ['1min', '15min', '8h', '1D']):
+        full = build_pyramid(sample, levels)
+
+        # Cascaded aggregation matches aggregating the base series directly
+        for level in levels[1:]:
+            pd.testing.assert_frame_equal(full[level], _aggregate(full[levels[0]], level),
+                                          check_freq=False)
+
+        # Incremental updates match a full rebuild: plain append, overlapping bars, backfill
+        for head, tail in ((sample.iloc[:-300], sample.iloc[-300:]),
+                           (sample.iloc[:-300], sample.iloc[-310:]),
+                           (sample.iloc[::2], sample.iloc[1::2])):
+            assert_same(update_pyramid(build_pyramid(head, levels), tail), full)
+
+    pyramid = build_pyramid(sample)
+
+    # Query picks the finest level that fits, and starts at the bucket holding start
+    assert query_pyramid(pyramid, max_points=1440)[0] == '1min'
+    assert query_pyramid(pyramid, max_points=300)[0] == '5min'
+    assert query_pyramid(pyramid, max_points=0)[0] == '1D'
+    level, bars = query_pyramid(pyramid, start='2020-09-23 10:37', max_points=20)
+    assert level == '1h' and bars.index[0] == pd.Timestamp('2020-09-23 10:00')
+    assert len(bars) == 14
+
+    # Levels that would misalign or are not fixed width are rejected up front
+    for levels in (['1min', '7min'], ['1min', '1D', '7D'], ['1min', '1h', '1W'], ['5min', '1min']):
+        try:
+            build_pyramid(sample, levels)
+        except ValueError:
+            continue
+        raise AssertionError(f"{levels} should have been rejected")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'pyramid.pkl')
+        save_pyramid(pyramid, path)
+        assert_same(load_pyramid(path), pyramid)
+
+    print('pyramid checks passed')